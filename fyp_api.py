@@ -0,0 +1,157 @@
+import argparse
+import hashlib
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fyp_cache import current_generation, get_result, source_mtimes, start_warm_up
+from fyp_compute import Q2Q_COLUMNS, REGION_COLUMNS
+
+# Serves the aggregates behind the app's charts as JSON so other dashboards don't need to scrape the Streamlit page.
+# Every response is built once at start up from the rollups the warm-up published (or computed with the same functions
+# until it has published), serialised, and kept in memory along with its ETag so a request is just a dictionary lookup.
+# They're rebuilt in the background whenever the warm-up publishes a new generation or a CSV changes. Run alongside or instead of the app with:
+#     python fyp_api.py --port 8502
+
+
+def json_number(value):
+    # NaN isn't valid JSON so missing values are sent as null
+    value = float(value)
+    return None if math.isnan(value) else value
+
+def genre_totals_payload(totals):
+    return [{"genre": genre, "hours_viewed": int(hours)} for genre, hours in zip(totals["Genre"], totals["Hours Viewed"])]
+
+def q2q_growth_payload(growth):
+    return {
+        "quarters": growth["Quarter"].tolist(),
+        "series": {service: [json_number(value) for value in growth[column]] for service, column in Q2Q_COLUMNS.items()},
+    }
+
+def spearman_payload(results):
+    return [{"x": x, "y": y, "statistic": json_number(statistic), "p_value": json_number(p_value)}
+            for (x, y), (statistic, p_value) in results.items()]
+
+def region_shares_payload(rollup):
+    return [{"quarter": quarter,
+             "subscribers": {region: json_number(row["subscribers", region]) for region in REGION_COLUMNS},
+             "shares": {region: json_number(row["shares", region]) for region in REGION_COLUMNS}}
+            for quarter, row in rollup.iterrows()]
+
+def encode_response(payload):
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    return body, etag
+
+def build_responses():
+    generation = current_generation()
+    payloads = {
+        "/api/genre-totals": genre_totals_payload(get_result("genre_totals", generation)),
+        "/api/q2q-growth": q2q_growth_payload(get_result("q2q_growth", generation)),
+        "/api/competition/spearman": spearman_payload(get_result("competition_spearman", generation)),
+        "/api/region-shares": region_shares_payload(get_result("region_shares", generation)),
+    }
+    payloads["/api"] = sorted(payloads)
+    return {path: encode_response(payload) for path, payload in payloads.items()}
+
+def data_version():
+    generation = current_generation()
+    return (None if generation is None else generation.manifest["generation"]), source_mtimes()
+
+def refresh_responses(server, interval):
+    # The whole dict is swapped in one assignment so a request sees either every old response or every new one
+    while True:
+        time.sleep(interval)
+        try:
+            start_warm_up()
+            version = data_version()
+            if version == server.data_version:
+                continue
+            server.responses = build_responses()
+            server.data_version = version
+        except Exception as e:
+            # Keep serving the last good responses, e.g. while a CSV is half written
+            print(f"Refreshing responses failed: {e}")
+
+def etag_matches(if_none_match, etag):
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, a W/ prefix is ignored
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class AggregateRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive so clients polling the API don't pay for a new connection on every request
+    protocol_version = "HTTP/1.1"
+    # Buffer the headers and body so each response goes out in one send (the buffer is flushed after every request),
+    # and turn off Nagle so a response never waits on the client's delayed ACK
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_cached(include_body=True)
+
+    def do_HEAD(self):
+        self.send_cached(include_body=False)
+
+    def send_cached(self, include_body):
+        response = self.server.responses.get(self.path.split("?", 1)[0])
+        if response is None:
+            body, etag = self.server.not_found
+            status = 404
+        else:
+            body, etag = response
+            if_none_match = self.headers.get("If-None-Match")
+            status = 304 if if_none_match and etag_matches(if_none_match, etag) else 200
+
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        if status == 304:
+            # No Content-Length, on a 304 it would have to be the 200's length. A 304 never has a body, so the
+            # connection is still kept alive without it
+            self.end_headers()
+            return
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def log_request(self, code="-", size="-"):
+        # Logging every request to stderr costs more than serving it, errors are still logged
+        pass
+
+
+def make_server(host, port, refresh_interval=1.0):
+    server = ThreadingHTTPServer((host, port), AggregateRequestHandler)
+    server.daemon_threads = True
+    start_warm_up()
+    server.data_version = data_version()
+    server.responses = build_responses()
+    server.not_found = encode_response({"error": "not found"})
+    threading.Thread(target=refresh_responses, args=(server, refresh_interval), daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Netflix analysis aggregates as JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--refresh-interval", type=float, default=1.0,
+                        help="seconds between checks for a new warm-up generation or changed CSV files")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.refresh_interval)
+    print(f"Serving {', '.join(sorted(server.responses))} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
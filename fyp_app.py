@@ -0,0 +1,8 @@
+# Streamlit entry point:
+#     streamlit run fyp_app.py
+# The app itself is in fyp_code. Process pool workers are spawned by re-running the main script, and started from here
+# they skip straight past it instead of importing streamlit and the whole app into every worker.
+
+if __name__ == "__main__":
+    from fyp_code import main
+    main()
@@ -0,0 +1,308 @@
+import argparse
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import signal
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from fyp_compute import DATASETS, PRECOMPUTED, load_dataset, compute_precomputed
+
+# Warm-up and shared dataset cache (see README.md). The app and the API start it in the background when nothing has
+# been published for the current CSVs, or it can be run on its own with:
+#     python fyp_cache.py
+# It loads every dataset and computes everything in PRECOMPUTED once, then writes a read-only generation file into a
+# directory in shared memory (/dev/shm) private to this user and checkout. Each worker maps that file so numeric columns are viewed in place rather than copied, and
+# every worker shares the same pages. When a CSV changes a new generation is written and the manifest pointing at it
+# is swapped in a single rename, so readers only ever see a complete generation.
+
+def default_cache_dir():
+    # /dev/shm and /tmp are shared by every user, so the cache lives in its own directory per user and per checkout
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    checkout = hashlib.sha256(os.path.dirname(os.path.abspath(__file__)).encode()).hexdigest()[:16]
+    return os.path.join(base, f"fyp_cache-{os.getuid()}-{checkout}")
+
+CACHE_DIR = os.environ.get("FYP_CACHE_DIR") or default_cache_dir()
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+# Held by the running warm-up so only one runs per checkout
+LOCK_PATH = os.path.join(CACHE_DIR, "warm_up.lock")
+# How long the app or API waits for a warm-up it started to publish before starting another
+WARM_UP_RETRY = 30
+ALIGNMENT = 64
+
+
+def cache_dir_is_private():
+    # Results are unpickled, so nothing is read from the cache unless it's a real directory (not a symlink) owned by
+    # this user that nobody else can write to
+    try:
+        dir_stat = os.lstat(CACHE_DIR)
+    except FileNotFoundError:
+        return False
+    return (stat.S_ISDIR(dir_stat.st_mode) and dir_stat.st_uid == os.getuid()
+            and stat.S_IMODE(dir_stat.st_mode) & 0o077 == 0)
+
+def make_cache_dir():
+    try:
+        os.mkdir(CACHE_DIR, 0o700)
+    except FileExistsError:
+        pass
+    if not cache_dir_is_private():
+        raise PermissionError(f"{CACHE_DIR} must be a directory owned by this user that only they can access (mode 0700)")
+
+def data_path(manifest):
+    # The manifest only names the data file, it's always read from the cache directory
+    return os.path.join(CACHE_DIR, os.path.basename(manifest["data"]))
+
+
+class Generation:
+    def __init__(self, manifest):
+        self.manifest = manifest
+        # Decoded once per process and then shared by every rerun, nothing that reads a result modifies it
+        self.results = {}
+        with open(data_path(manifest), "rb") as data_file:
+            # The mapping stays valid after the file is replaced and unlinked, until the last view of it is dropped
+            self.buffer = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __contains__(self, key):
+        return key in self.manifest["results"]
+
+    def dataset(self, name):
+        spec = self.manifest["datasets"][name]
+        columns = {}
+        for column in spec["columns"]:
+            if "dtype" in column:
+                # Read-only view onto the shared pages, nothing is copied
+                columns[column["name"]] = np.frombuffer(self.buffer, dtype=column["dtype"], count=spec["rows"],
+                                                        offset=column["offset"])
+            else:
+                # Text columns can't be viewed in place, pandas needs a Python str object for every value
+                columns[column["name"]] = json.loads(self.read(column))
+        # copy=False keeps each column as its own block so pandas doesn't consolidate them into a new array
+        return pd.DataFrame(columns, copy=False)
+
+    def result(self, key):
+        if key not in self.results:
+            self.results[key] = self.decode(self.manifest["results"][key])
+        return self.results[key]
+
+    def decode(self, span):
+        data = self.read(span)
+        if span["encoding"] == "plotly":
+            # The figure's JSON, which st.plotly_chart takes as is. Unpickling a go.Figure re-runs plotly's validation
+            # and costs as much as building it again
+            return json.loads(data)
+        if span["encoding"] == "bytes":
+            return data
+        return pickle.loads(data)
+
+    def read(self, span):
+        return self.buffer[span["offset"]:span["offset"] + span["length"]]
+
+
+_lock = threading.Lock()
+_current = None
+_current_stat = None
+
+def current_generation():
+    # Returns the generation the warm-up process last published, or None if it isn't running or the CSVs have changed
+    # since it was built (e.g. a warm-up that was killed and left its manifest behind)
+    global _current, _current_stat
+    if not cache_dir_is_private():
+        return None
+    try:
+        manifest_stat = os.stat(MANIFEST_PATH)
+    except FileNotFoundError:
+        return None
+    if manifest_stat.st_uid != os.getuid():
+        return None
+    with _lock:
+        if (manifest_stat.st_ino, manifest_stat.st_mtime_ns) != _current_stat:
+            try:
+                with open(MANIFEST_PATH) as manifest_file:
+                    _current = Generation(json.load(manifest_file))
+            except FileNotFoundError:
+                # Swapped out from under us, fall back to computing locally until the next call
+                return None
+            _current_stat = (manifest_stat.st_ino, manifest_stat.st_mtime_ns)
+        generation = _current
+    if not sources_unchanged(generation.manifest["sources"]):
+        return None
+    return generation
+
+_warm_up_started = None
+
+def start_warm_up():
+    # Called by the app and the API. If nothing has been published for the current CSVs, starts the warm-up in the
+    # background, where it stops with this process. A second one started by another worker exits straight away
+    global _warm_up_started
+    if current_generation() is not None:
+        return
+    with _lock:
+        if _warm_up_started is not None and time.monotonic() - _warm_up_started < WARM_UP_RETRY:
+            return
+        _warm_up_started = time.monotonic()
+    subprocess.Popen([sys.executable, os.path.abspath(__file__), "--parent", str(os.getpid())])
+
+def get_dataset(name):
+    generation = current_generation()
+    if generation is None:
+        return load_dataset(name)
+    return generation.dataset(name)
+
+def compute_result(key):
+    # For anything the warm-up hasn't published, loads only the dataset the builder needs. Safe to run in a worker process
+    _, dataset, *_ = PRECOMPUTED[key]
+    return compute_precomputed(key, None if dataset is None else get_dataset(dataset))
+
+def get_result(key, generation):
+    if generation is not None and key in generation:
+        return generation.result(key)
+    return compute_result(key)
+
+
+def source_mtimes():
+    return {path: os.stat(path).st_mtime_ns for path in DATASETS.values()}
+
+def sources_unchanged(sources):
+    try:
+        return source_mtimes() == sources
+    except FileNotFoundError:
+        return False
+
+def remove_files(names):
+    # Removes these data files, and the manifest only if it points at one of them
+    try:
+        with open(MANIFEST_PATH) as manifest_file:
+            published = json.load(manifest_file)["data"]
+    except (FileNotFoundError, ValueError, KeyError):
+        published = None
+    if published in names:
+        os.remove(MANIFEST_PATH)
+    for name in names:
+        try:
+            os.remove(os.path.join(CACHE_DIR, name))
+        except FileNotFoundError:
+            pass
+
+def write_generation(datasets, results, sources, written):
+    generation = f"{time.time_ns()}-{os.getpid()}"
+    manifest = {"generation": generation, "data": f"fyp_cache-{generation}.bin", "sources": sources, "datasets": {},
+                "results": {}}
+    manifest_tmp_path = f"{MANIFEST_PATH}.{generation}.tmp"
+    # Recorded before the file is created so the caller can clean it up however this exits
+    written.add(manifest["data"])
+    try:
+        write_data(manifest, datasets, results)
+        with open(manifest_tmp_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(manifest_tmp_path, MANIFEST_PATH)
+    except BaseException:
+        # e.g. /dev/shm filling up or a SIGTERM part way through, don't leave a partial file behind in memory
+        remove_files({manifest["data"]})
+        written.discard(manifest["data"])
+        if os.path.exists(manifest_tmp_path):
+            os.remove(manifest_tmp_path)
+        raise
+    return manifest
+
+def write_data(manifest, datasets, results):
+    with open(data_path(manifest), "wb") as data_file:
+        def add(data):
+            offset = -(-data_file.tell() // ALIGNMENT) * ALIGNMENT
+            data_file.seek(offset)
+            data_file.write(data)
+            return {"offset": offset, "length": len(data)}
+
+        for name, df in datasets.items():
+            columns = []
+            for column in df.columns:
+                values = df[column].to_numpy()
+                if values.dtype.kind in "biuf":
+                    columns.append({"name": column, "dtype": values.dtype.str, **add(np.ascontiguousarray(values).tobytes())})
+                else:
+                    columns.append({"name": column, **add(json.dumps(values.tolist()).encode("utf-8"))})
+            manifest["datasets"][name] = {"rows": len(df), "columns": columns}
+
+        for key, result in results.items():
+            manifest["results"][key] = add_result(add, result)
+    os.chmod(data_path(manifest), 0o444)
+
+def add_result(add, result):
+    if isinstance(result, go.Figure):
+        return {"encoding": "plotly", **add(result.to_json(validate=False).encode("utf-8"))}
+    if isinstance(result, bytes):
+        # The heatmap PNGs
+        return {"encoding": "bytes", **add(result)}
+    # Rollup DataFrames and the Spearman results, only ever written and read by this user (see cache_dir_is_private)
+    return {"encoding": "pickle", **add(pickle.dumps(result))}
+
+def warm_up(process_pool, written):
+    # Taken before loading so a CSV edited mid warm-up is picked up on the next check
+    sources = source_mtimes()
+    with ThreadPoolExecutor() as thread_pool:
+        datasets = dict(zip(DATASETS, thread_pool.map(load_dataset, DATASETS)))
+    futures = {key: process_pool.submit(compute_precomputed, key, datasets.get(dataset))
+               for key, (_, dataset, *_) in PRECOMPUTED.items()}
+    results = {key: future.result() for key, future in futures.items()}
+    return write_generation(datasets, results, sources, written)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the Netflix analysis and share it between worker processes")
+    parser.add_argument("--interval", type=float, default=5, help="seconds between checks for changed CSV files")
+    parser.add_argument("--parent", type=int, help="exit once the process with this pid has (set by start_warm_up)")
+    args = parser.parse_args()
+    # kill and service managers send SIGTERM, exit through the cleanup below rather than leaving the manifest behind
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    make_cache_dir()
+    lock_file = open(LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print(f"A warm-up is already running for {CACHE_DIR}")
+        return
+    # Every data file this process has written and not yet removed, only these (and the manifest if it points at one of
+    # them) are cleaned up on exit, never another process's
+    written = set()
+    with ProcessPoolExecutor() as process_pool:
+        try:
+            manifest = warm_up(process_pool, written)
+            print(f"Published generation {manifest['generation']} to {MANIFEST_PATH}")
+            while True:
+                time.sleep(args.interval)
+                if args.parent is not None and os.getppid() != args.parent:
+                    break
+                try:
+                    if source_mtimes() == manifest["sources"]:
+                        continue
+                    previous = manifest
+                    manifest = warm_up(process_pool, written)
+                except Exception as e:
+                    # Keep serving the last good generation, e.g. while a CSV is half written
+                    print(f"Warm-up failed, keeping generation {manifest['generation']}: {e}")
+                    continue
+                # Workers still holding the old generation keep their mapping until they're done with it
+                os.remove(data_path(previous))
+                written.discard(previous["data"])
+                print(f"Published generation {manifest['generation']} to {MANIFEST_PATH}")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            remove_files(written)
+
+
+if __name__ == "__main__":
+    main()
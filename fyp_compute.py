@@ -0,0 +1,476 @@
+import io
+
+import pandas as pd
+import plotly.graph_objects as go
+import seaborn as sns
+from matplotlib.figure import Figure
+from scipy.stats import spearmanr
+
+# Figure and statistics builders used by the app. Nothing in here touches Streamlit so these can be
+# run in worker processes and their results sent back to the page to be rendered.
+
+
+DATASETS = {
+    "netflix": "just_netflix_data.csv",
+    "competition": "Sub_Change_Summary.csv",
+    "region": "netflix_region_breakdown.csv",
+    "content_spend": "Netflix_Content_Spend.csv",
+    "watchtime": "Watchtime_Netflix.csv",
+    "genre": "Netflix_Genre_Breakdown.csv",
+}
+
+SUBSCRIBERS_COLUMNS = ["Disney+ Subscribers", "Netflix Subscribers", "Hulu Subscribers"]
+COMPETITORS_Q2Q_COLUMNS = ["Disney Sub Change Q2Q", "Hulu Sub Change Q2Q", "Netflix Subscribers"]
+
+SPEARMAN_PAIRS = [
+    ("Netflix Subscribers", "Disney+ Subscribers"),
+    ("Netflix Subscribers", "Hulu Subscribers"),
+    ("Hulu Subscribers", "Disney+ Subscribers"),
+    ("Netflix Subscribers", "Disney Sub Change Q2Q"),
+    ("Netflix Subscribers", "Hulu Sub Change Q2Q"),
+]
+
+Q2Q_COLUMNS = {
+    "Netflix": "Netflix Sub Change Q2Q",
+    "Disney+": "Disney Sub Change Q2Q",
+    "Hulu": "Hulu Sub Change Q2Q",
+    "Peacock": "Peacock Sub Change Q2Q",
+}
+
+SERVICE_COLORS = {"Netflix": "red", "Disney+": "blue", "Hulu": "green", "Peacock": "black"}
+
+REGION_COLUMNS = ['UCAN Sub', 'EMEA Sub', 'LATAM Sub', 'APAC Sub']
+
+
+def load_dataset(name):
+    df = pd.read_csv(DATASETS[name])
+    if name == "genre":
+        df = clean_genre_data(df)
+    return df
+
+def clean_genre_data(df_genre):
+    # Remove commas from "Hours Viewed" and convert to integer
+    df_genre["Hours Viewed"] = df_genre["Hours Viewed"].str.replace(",", "").astype(int)
+    return df_genre
+
+def genre_totals(df_genre):
+    genre_sum = df_genre.groupby("Genre")["Hours Viewed"].sum().reset_index()
+    return genre_sum.sort_values(by="Hours Viewed", ascending=False)
+
+def q2q_growth(df_data):
+    return df_data[["Quarter"] + list(Q2Q_COLUMNS.values())]
+
+def region_shares(df_region):
+    # Subscribers per region for each quarter alongside each region's share of that quarter's total
+    subscribers = df_region.set_index('Quarter')[REGION_COLUMNS]
+    shares = subscribers.div(subscribers.sum(axis=1), axis=0)
+    return pd.concat({"subscribers": subscribers, "shares": shares}, axis=1)
+
+
+def Q4_sub_growth_figure(df_netflix_data):
+    q4_mask = df_netflix_data['Just Quarter Value'] == 'Q4'
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df_netflix_data['Quarter'], y=df_netflix_data['Sub Increase Q2Q M'],
+                             mode='lines+markers', name='Netflix', line=dict(color='red')))
+    fig.add_trace(go.Scatter(x=df_netflix_data[q4_mask]['Quarter'], y=df_netflix_data[q4_mask]['Sub Increase Q2Q M'],
+                             mode='markers', name='Q4', marker=dict(color='blue', size=10, symbol='cross')))
+
+    # Update layout
+    fig.update_layout(title='Netflix Q4 Subscription Increase', xaxis_title='Quarter', yaxis_title='Subscription Increase')
+
+    return fig
+
+def lockdown_effect_figure(df_netflix_data):
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(x=df_netflix_data['Quarter'], y=df_netflix_data['Sub Increase Q2Q M'], mode='lines+markers', name='Netflix',
+                             line=dict(color='red')))
+
+    fig.add_annotation(
+        go.layout.Annotation(
+            x='20Q1',
+            y=15,
+            xref="x",
+            yref="y",
+            text="Beginning of COVID-19 Pandemic",
+            showarrow=True,
+            arrowhead=2,
+            ax=-100,
+            ay=-40
+        )
+    )
+
+    # Add markers for each level of lockdown separately
+    fig.add_trace(go.Scatter(x=df_netflix_data[df_netflix_data['Level of Lockdown'] == 'No Lockdown']['Quarter'],
+                             y=df_netflix_data[df_netflix_data['Level of Lockdown'] == 'No Lockdown']['Sub Increase Q2Q M'],
+                             mode='markers', marker=dict(color='green', size=10), name='No Lockdown'))
+
+    fig.add_trace(go.Scatter(x=df_netflix_data[df_netflix_data['Level of Lockdown'] == 'Weak Lockdown']['Quarter'],
+                             y=df_netflix_data[df_netflix_data['Level of Lockdown'] == 'Weak Lockdown']['Sub Increase Q2Q M'],
+                             mode='markers', marker=dict(color='yellow', size=10), name='Weak Lockdown'))
+
+    fig.add_trace(go.Scatter(x=df_netflix_data[df_netflix_data['Level of Lockdown'] == 'Strong Lockdown']['Quarter'],
+                             y=df_netflix_data[df_netflix_data['Level of Lockdown'] == 'Strong Lockdown']['Sub Increase Q2Q M'],
+                             mode='markers', marker=dict(color='red', size=10), name='Strong Lockdown'))
+
+    fig.update_layout(title_text='Effect of Lockdown on Netflix Sub Growth',
+                      xaxis_title='Quarter',
+                      yaxis_title='Sub Increase in millions',
+                      height=370)
+
+    return fig
+
+def price_hikes_figure(df_netflix_data):
+    # Create a Plotly figure
+    fig = go.Figure()
+
+    # Add trace for Netflix subscription growth
+    fig.add_trace(go.Scatter(
+        x=df_netflix_data['Quarter'],
+        y=df_netflix_data['Sub Increase Q2Q M'],
+        mode='lines+markers',
+        name='Netflix',
+        line=dict(color='red')
+    ))
+
+    # Add markers for price hike quarters
+    price_hike_quarters = df_netflix_data[df_netflix_data['Price Hike for at least 1 plan'] == True]['Quarter']
+    fig.add_trace(go.Scatter(
+        x=price_hike_quarters,
+        y=df_netflix_data.loc[df_netflix_data['Price Hike for at least 1 plan'] == True, 'Sub Increase Q2Q M'],
+        mode='markers',
+        name='Price Hike for at least 1 plan',
+        marker=dict(symbol='x', size=13, color='orange')
+    ))
+
+    # Update layout
+    fig.update_layout(
+        title_text='Netflix Price Hikes Effect',
+        xaxis_title='Quarter',
+        yaxis_title='Sub Increase in millions',
+        height=370
+    )
+
+    return fig
+
+
+def password_sharing_crackdown_figure(df_netflix_data):
+
+    # Create the plot
+    fig = go.Figure()
+
+    # Add the main trace (Netflix subscription growth)
+    fig.add_trace(go.Scatter(x=df_netflix_data['Quarter'],
+                             y=df_netflix_data['Sub Increase Q2Q M'],
+                             mode='lines+markers',
+                             name='Netflix',
+                             line=dict(color='red'),
+                             showlegend=True))
+
+    # Add a vertical rectangle to highlight the period of password sharing crackdown
+    fig.add_vrect(x0='23Q1', x1=df_netflix_data['Quarter'].max(),
+                  fillcolor="rgba(0,0,255,0.2)", layer="below", line_width=0)
+
+    # Add an annotation to mark the password sharing crackdown
+    fig.add_annotation(
+        go.layout.Annotation(
+            x='23Q1',
+            y=10,  # Adjust the y-position as needed
+            xref="x",
+            yref="y",
+            text="Password Sharing Crackdown",
+            showarrow=True,
+            arrowhead=2,
+            ax=-70,
+            ay=-30
+        )
+    )
+
+    # Update layout
+    fig.update_layout(title_text='Effect of Password Sharing Crackdown on Sub Growth',
+                      xaxis_title='Quarter',
+                      yaxis_title='Sub Increase in millions',
+                      height=370,
+                      showlegend=True)
+
+    return fig
+
+
+def heatmap_png(df_data, columns=None):
+    # Every column apart from Quarter unless told otherwise
+    if columns is None:
+        columns = df_data.columns[df_data.columns != 'Quarter']
+    # Rendered without pyplot so no global figure state is shared between workers
+    correlation_matrix = df_data[columns].corr()
+    fig = Figure(figsize=(8, 6))
+    ax = fig.subplots()
+    sns.heatmap(correlation_matrix, annot=True, cmap='viridis', fmt=".2f", ax=ax)
+    ax.set_title('Correlation Matrix Heatmap')
+    image = io.BytesIO()
+    fig.savefig(image, format="png", bbox_inches="tight", dpi=200)
+    return image.getvalue()
+
+def competition_spearman(df_data):
+    results = {}
+    for x, y in SPEARMAN_PAIRS:
+        statistic, p_value = spearmanr(df_data[x], df_data[y])
+        results[(x, y)] = (statistic, p_value)
+    return results
+
+def streaming_services_Q2Q_growth_figure(df_data):
+    growth = q2q_growth(df_data)
+    fig = go.Figure()
+
+    for service, column in Q2Q_COLUMNS.items():
+        fig.add_trace(go.Scatter(x=growth['Quarter'],
+                                 y=growth[column],
+                                 mode='lines+markers',
+                                 name=service,
+                                 line=dict(color=SERVICE_COLORS[service])))
+
+    fig.update_layout(title_text='Quarterly Subscription Growth of Streaming Services',
+                      xaxis_title='Quarter',
+                      yaxis_title='Sub Increase in millions',
+                      height=370,
+                      showlegend=True)
+
+    return fig
+
+def total_subscriber_growth_figure(df_data):
+    fig = go.Figure()
+
+
+    fig.add_trace(go.Scatter(x=df_data['Quarter'],
+                             y=df_data['Netflix Subscribers'],
+                             mode='lines+markers',
+                             name='Netflix',
+                             line=dict(color='red')))
+
+    fig.add_trace(go.Scatter(x=df_data['Quarter'],
+                             y=df_data['Disney+ Subscribers'],
+                             mode='lines+markers',
+                             name='Disney+',
+                             line=dict(color='blue')))
+
+    fig.add_trace(go.Scatter(x=df_data['Quarter'],
+                             y=df_data['Hulu Subscribers'],
+                             mode='lines+markers',
+                             name='Hulu',
+                             line=dict(color='green')))
+
+    fig.add_trace(go.Scatter(x=df_data['Quarter'],
+                             y=df_data['Peacock Subscribers'],
+                             mode='lines+markers',
+                             name='Peacock',
+                             line=dict(color='black')))
+
+    fig.update_layout(title_text='Total Subscriber Growth for Streaming Services',
+                      xaxis_title='Quarter',
+                      yaxis_title='Subscribers in millions',
+                      height=370,
+                      showlegend=True)
+
+    return fig
+
+def netflix_subscription_growth_figure(df_netflix_data):
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(x=df_netflix_data['Quarter'],
+                             y=df_netflix_data['Sub Increase Q2Q M'],
+                             mode='lines+markers',
+                             name='Netflix',
+                             line=dict(color='red')))
+
+    fig.update_layout(title_text='Netflix Quarterly Subscription Growth',
+                      xaxis_title='Quarter',
+                      yaxis_title='Sub Increase in millions',
+                      height=370,
+                      showlegend=True)
+
+    return fig
+
+def genre_total_hours_figure(df_genre):
+    genre_sum_sorted = genre_totals(df_genre)
+    fig_genre_total_hours = go.Figure(
+        data=[go.Bar(
+            x=genre_sum_sorted["Genre"],
+            y=genre_sum_sorted["Hours Viewed"],
+            name="Total Hours Viewed"
+        )]
+    )
+    fig_genre_total_hours.update_layout(
+        title="Total Hours Viewed by Genre",
+        xaxis_title="Genre",
+        yaxis_title="Total Hours Viewed",
+        yaxis=dict(range=[0, genre_sum_sorted["Hours Viewed"].max() + 1000000])
+    )
+    return fig_genre_total_hours
+
+def genre_comparison_figure(df_genre):
+    df_children = df_genre[df_genre['Genre'] == 'Children']
+    cocomelon_hours = df_children[df_children['Title'].str.contains('CoComelon', case=False)]['Hours Viewed'].sum()
+    paw_patrol_hours = df_children[df_children['Title'].str.contains('PAW Patrol', case=False)]['Hours Viewed'].sum()
+    other_hours = df_children[~df_children['Title'].str.contains('CoComelon|PAW Patrol', case=False)]['Hours Viewed'].sum()
+
+    fig_genre_comparison = go.Figure()
+    fig_genre_comparison.add_trace(go.Bar(
+        x=['CoComelon & PAW Patrol', 'All Other Childrens Shows'],
+        y=[cocomelon_hours + paw_patrol_hours, other_hours],
+        marker_color=['blue', 'green']
+    ))
+    fig_genre_comparison.update_layout(
+        title='CoComelon & PAW Patrol Compared to All Other Childrens TV Shows',
+        xaxis_title='Category',
+        yaxis_title='Combined Viewing Hours'
+    )
+    return fig_genre_comparison
+
+def region_breakdown_figure(df_region):
+    subscribers = region_shares(df_region)["subscribers"]
+    fig = go.Figure()
+
+    values = subscribers.iloc[0].tolist()
+    pie_chart = go.Pie(labels=REGION_COLUMNS, values=values, name=subscribers.index[0])
+    fig.add_trace(pie_chart)
+
+    buttons = [dict(label='Play',
+                     method='animate',
+                     args=[None, dict(frame=dict(duration=400, redraw=True), fromcurrent=True)]),
+               dict(label='Pause',
+                    method='animate',
+                    args=[[None], dict(frame=dict(duration=0, redraw=True), mode='immediate')])]
+
+    fig.update_layout(title='Subscription Distribution Over Quarters in Millions',
+                      updatemenus=[dict(type='buttons', showactive=False, buttons=buttons)],
+                      annotations=[dict(text=subscribers.index[0], showarrow=False, x=0.9, y=0.3, font=dict(size=20))],
+                      height=380,
+                      legend=dict(traceorder='normal', title=dict(font=dict(size=16)), font=dict(size=18)))  # Set the legend font size
+
+    frames = [go.Frame(data=[go.Pie(labels=REGION_COLUMNS,
+                                    values=values.tolist(),
+                                    name=quarter)],
+                       name=quarter,
+                       layout=dict(annotations=[dict(text=quarter, showarrow=False, x=0.8, y=0.5, font=dict(size=20))]))
+              for quarter, values in subscribers.iterrows()]
+
+    fig.frames = frames
+
+    return fig
+
+def content_spend_figure(df_content):
+    trace1 = go.Bar(x=df_content["Year"], y=df_content["North American"], name='North American')
+    trace2 = go.Bar(x=df_content["Year"], y=df_content["International"], name='International')
+
+    fig = go.Figure(data=[trace1, trace2])
+    fig.update_layout(barmode='stack',
+                      title='Netflix Yearly Content Spend',
+                      xaxis_title='Year',
+                      yaxis_title='Netflix Content spend $B')
+
+    return fig
+
+def total_hours_viewed_figure():
+    total_hours_viewed = 93455200000
+    top_10_hours_viewed = 4951700000
+    top_100_hours_viewed = 18312100000
+    top_10_to_100_hours_viewed = 13360400000
+    top_10_to_500_hours_viewed = 21768700000
+    x_data = ['Total Hours Viewed']
+    y_data = [total_hours_viewed]
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Bar(
+        x=x_data,
+        y=y_data,
+        name='Total Hours Viewed',
+        marker_color='rgba(200,200,200,1)',
+        width=0.3
+    ))
+
+    fig.add_trace(go.Bar(
+        x=x_data,
+        y=[top_10_hours_viewed],
+        name='Top 10 Shows',
+        marker_color='rgba(0,0,200,1)',
+        base=0,
+        width=0.3
+    ))
+
+    fig.add_trace(go.Bar(
+        x=x_data,
+        y=[top_10_to_100_hours_viewed],
+        name='Top 100 Shows',
+        marker_color='rgba(200,0,0,1)',
+        base=top_10_hours_viewed,
+        width=0.3
+    ))
+
+    fig.add_trace(go.Bar(
+        x=x_data,
+        y=[top_10_to_500_hours_viewed],
+        name='Top 500 Shows',
+        marker_color='rgba(0,200,0,1)',
+        base=top_100_hours_viewed,
+        width=0.3
+    ))
+
+    fig.update_layout(
+        title='Total Hours Viewed on Netflix in 2023',
+        yaxis=dict(title='Hours'),
+        barmode='stack'
+    )
+
+    return fig
+
+def content_by_year_figure(df_watchtime):
+    df_watchtime = df_watchtime.dropna(subset=["Release Date"])
+    df_watchtime['Release Date'] = pd.to_datetime(df_watchtime['Release Date'])
+    df_watchtime['Year'] = df_watchtime['Release Date'].dt.year
+    year_counts = df_watchtime['Year'].value_counts().sort_index()
+    #Data is from June 2023 so not accurate for full year
+    year_counts = year_counts.drop(2023, errors='ignore')
+    fig = go.Figure(data=[go.Bar(x=year_counts.index, y=year_counts.values)])
+    fig.update_layout(
+        title='Netflix Content By Year of Release',
+        xaxis=dict(title='Release Year'),
+        yaxis=dict(title='# Films On Netflix')
+    )
+    return fig
+
+
+# Everything the app and the API show, keyed by name, as (builder, dataset the builder is given, extra arguments).
+# The warm-up in fyp_cache computes all of these once and publishes them for every worker process to share.
+PRECOMPUTED = {
+    "netflix_subscription_growth": (netflix_subscription_growth_figure, "netflix"),
+    "Q4_sub_growth": (Q4_sub_growth_figure, "netflix"),
+    "lockdown_effect": (lockdown_effect_figure, "netflix"),
+    "price_hikes": (price_hikes_figure, "netflix"),
+    "password_sharing_crackdown": (password_sharing_crackdown_figure, "netflix"),
+    "subscribers_heatmap": (heatmap_png, "competition", SUBSCRIBERS_COLUMNS),
+    "expanded_heatmap": (heatmap_png, "competition"),
+    "competitors_Q2Q_heatmap": (heatmap_png, "competition", COMPETITORS_Q2Q_COLUMNS),
+    "competition_spearman": (competition_spearman, "competition"),
+    "streaming_services_Q2Q_growth": (streaming_services_Q2Q_growth_figure, "competition"),
+    "total_subscriber_growth": (total_subscriber_growth_figure, "competition"),
+    "q2q_growth": (q2q_growth, "competition"),
+    "total_hours_viewed": (total_hours_viewed_figure, None),
+    "content_by_year": (content_by_year_figure, "watchtime"),
+    "genre_total_hours": (genre_total_hours_figure, "genre"),
+    "genre_comparison": (genre_comparison_figure, "genre"),
+    "genre_totals": (genre_totals, "genre"),
+    "content_spend": (content_spend_figure, "content_spend"),
+    "region_breakdown": (region_breakdown_figure, "region"),
+    "region_shares": (region_shares, "region"),
+}
+
+def compute_precomputed(key, df=None):
+    func, dataset, *args = PRECOMPUTED[key]
+    if dataset is None:
+        return func(*args)
+    return func(df, *args)
+
+# The stats and matplotlib rendering that are worth sending to a worker process. Everything else builds a plotly figure
+# in a few milliseconds, less than it takes to send the figure back, so those are built in the app's own threads
+CPU_BOUND = {"subscribers_heatmap", "expanded_heatmap", "competitors_Q2Q_heatmap", "competition_spearman"}
@@ -0,0 +1,54 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Worker pools shared by every session of the app. Nothing in here touches Streamlit, and the app is started through
+# fyp_app.py, which does nothing unless it's run as the main script. A spawned worker re-runs the main script before
+# it starts, so it only ever imports what the tasks it's given need (fyp_compute).
+
+# Only the correlation heatmaps and Spearman tests run in worker processes (see fyp_compute.CPU_BOUND), so a couple of
+# workers is enough and each one costs a full pandas/scipy/matplotlib import and its own memory
+PROCESS_WORKERS = min(2, os.cpu_count() or 1)
+
+
+class ProcessPool:
+    # Workers are started on demand rather than up front, and if one dies the pool is replaced on the next submit
+    # rather than every later page failing with BrokenProcessPool
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn so workers don't inherit the locks of the server's threads
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, func, *args):
+        executor = self.executor()
+        try:
+            return executor.submit(func, *args)
+        except BrokenProcessPool:
+            self.discard(executor)
+            return self.executor().submit(func, *args)
+
+
+_process_pool = ProcessPool(PROCESS_WORKERS)
+_thread_pool = ThreadPoolExecutor()
+
+def get_process_pool():
+    return _process_pool
+
+def get_thread_pool():
+    return _thread_pool